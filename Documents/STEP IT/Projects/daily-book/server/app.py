@@ -1,11 +1,15 @@
 import os
 import json
+import string
+import zlib
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
+from sqlalchemy.orm import defer
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 
 app = Flask(__name__)
@@ -13,13 +17,96 @@ CORS(app, supports_credentials=True, origins=["http://localhost:3000"]) # Enable
 app.config['SECRET_KEY'] = 'your_secret_key' # Replace with a strong secret key
 UPLOAD_FOLDER = 'uploads'
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///dailybook.db'
+# Must stay SQLite: CompressedText stores blobs in TEXT columns (dynamic typing).
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DAILYBOOK_DATABASE_URI', 'sqlite:///dailybook.db')
+app.config['COMPRESS_TEXT'] = False # zlib-compress long diary/note bodies on write (smaller db, slower reads)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db = SQLAlchemy(app)
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login' # Redirect to login if not authenticated
 
+# Preset dictionaries for diary/note compression, keyed by the version byte
+# stored with each body. Version 0 is plain zlib. To add a dictionary, run
+# build_text_zdict.py on a sample of real user text, ship the file under the
+# next version number and point TEXT_ZDICT_VERSION at it. Never edit or drop a
+# dictionary that rows may already be compressed with.
+TEXT_ZDICTS = {0: None}
+TEXT_ZDICT_VERSION = 0
+COMPRESSED_TEXT_MAGIC = b'\x00Z'
+COMPRESSED_TEXT_MIN_LENGTH = 256
+
+class CompressedText(TypeDecorator):
+    """Text column that can zlib-compress long values.
+
+    Compression on write is off unless app.config['COMPRESS_TEXT'] is set.
+    Short values, and rows written without compression, stay plain TEXT;
+    compressed values are stored as a blob of COMPRESSED_TEXT_MAGIC, a
+    dictionary version byte and the zlib stream. Reads handle both, so the
+    setting can be toggled without a migration. Compressed bodies cannot be
+    matched with LIKE, see search_text_column().
+    """
+    impl = db.Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, str):
+            value = str(value)
+        raw = value.encode('utf-8')
+        if not app.config['COMPRESS_TEXT'] or len(raw) < COMPRESSED_TEXT_MIN_LENGTH:
+            return value
+        zdict = TEXT_ZDICTS[TEXT_ZDICT_VERSION]
+        compressor = zlib.compressobj(9, zdict=zdict) if zdict else zlib.compressobj(9)
+        packed = (COMPRESSED_TEXT_MAGIC + bytes([TEXT_ZDICT_VERSION])
+                  + compressor.compress(raw) + compressor.flush())
+        return packed if len(packed) < len(raw) else value
+
+    def process_result_value(self, value, dialect):
+        if not isinstance(value, bytes):
+            return value
+        if not value.startswith(COMPRESSED_TEXT_MAGIC):
+            return value.decode('utf-8')
+        version = value[len(COMPRESSED_TEXT_MAGIC)]
+        if version not in TEXT_ZDICTS:
+            raise ValueError(f'Unknown compressed text dictionary version {version}')
+        zdict = TEXT_ZDICTS[version]
+        decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+        body = value[len(COMPRESSED_TEXT_MAGIC) + 1:]
+        return (decompressor.decompress(body) + decompressor.flush()).decode('utf-8')
+
+# SQLite's lower()/LIKE only fold ASCII letters; compressed rows matched in
+# Python use the same folding so results don't depend on how a row is stored.
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+def like_pattern(query):
+    """Return a '%query%' pattern with LIKE wildcards escaped (use escape='\\')."""
+    escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+def text_matches(text, query):
+    return bool(text) and query.translate(ASCII_LOWER) in text.translate(ASCII_LOWER)
+
+def search_text_column(base_query, model, query, extra_match=None):
+    """Return rows of base_query whose text (or extra_match) contains query.
+
+    Plain TEXT rows and extra_match are filtered with ILIKE in the database;
+    only compressed rows that SQL could not already match are loaded and
+    searched in Python, with the same literal, ASCII-case-insensitive rules.
+    """
+    is_plain = db.func.typeof(model.text) == 'text'
+    sql_match = db.and_(is_plain, model.text.ilike(like_pattern(query), escape='\\'))
+    if extra_match is not None:
+        sql_match = db.or_(sql_match, extra_match)
+    matches = base_query.filter(sql_match).all()
+
+    compressed = base_query.filter(db.func.typeof(model.text) == 'blob')
+    if extra_match is not None:
+        compressed = compressed.filter(db.not_(extra_match))
+    matches.extend(row for row in compressed.all() if text_matches(row.text, query))
+    return matches
+
 # Database Models
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -46,7 +133,7 @@ def load_user(user_id):
 
 class DiaryEntry(db.Model):
     date = db.Column(db.String(10), primary_key=True) # YYYY-MM-DD
-    text = db.Column(db.Text, nullable=True)
+    text = db.Column(CompressedText, nullable=True)
     imageUrl = db.Column(db.String(255), nullable=True)
     tags = db.Column(db.Text, nullable=True) # Stored as JSON string
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
@@ -61,7 +148,7 @@ class DiaryEntry(db.Model):
 
 class Note(db.Model):
     date = db.Column(db.String(10), primary_key=True) # YYYY-MM-DD
-    text = db.Column(db.Text, nullable=True)
+    text = db.Column(CompressedText, nullable=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
 
     def to_dict(self):
@@ -321,20 +408,16 @@ def search():
     search_results = []
     
     # Search Diary Entries
-    diary_entries = DiaryEntry.query.filter(
-        DiaryEntry.user_id == current_user.id,
-        (DiaryEntry.text.ilike(f'%{query}%')) | (DiaryEntry.tags.ilike(f'%{query}%'))
-    ).all()
+    diary_entries = search_text_column(
+        DiaryEntry.query.filter_by(user_id=current_user.id), DiaryEntry, query,
+        extra_match=DiaryEntry.tags.ilike(like_pattern(query), escape='\\'))
     for entry in diary_entries:
         result = entry.to_dict()
         result['type'] = 'diary'
         search_results.append(result)
 
     # Search Notes
-    notes = Note.query.filter(
-        Note.user_id == current_user.id,
-        Note.text.ilike(f'%{query}%')
-    ).all()
+    notes = search_text_column(Note.query.filter_by(user_id=current_user.id), Note, query)
     for note in notes:
         result = note.to_dict()
         result['type'] = 'note'
@@ -343,7 +426,7 @@ def search():
     # Search Reminders
     reminders = Reminder.query.filter(
         Reminder.user_id == current_user.id,
-        Reminder.text.ilike(f'%{query}%')
+        Reminder.text.ilike(like_pattern(query), escape='\\')
     ).all()
     for reminder in reminders:
         result = reminder.to_dict()
@@ -353,7 +436,7 @@ def search():
     # Search Todo Items
     todos = TodoItem.query.filter(
         TodoItem.user_id == current_user.id,
-        TodoItem.text.ilike(f'%{query}%')
+        TodoItem.text.ilike(like_pattern(query), escape='\\')
     ).all()
     for todo in todos:
         result = todo.to_dict()
@@ -366,7 +449,7 @@ def search():
 @login_required
 def get_all_tags():
     all_tags = set()
-    diary_entries = DiaryEntry.query.filter_by(user_id=current_user.id).all()
+    diary_entries = DiaryEntry.query.filter_by(user_id=current_user.id).options(defer(DiaryEntry.text)).all()
     for entry in diary_entries:
         if entry.tags:
             try:
@@ -389,7 +472,7 @@ def rename_tag():
     if old_tag == new_tag:
         return jsonify({'message': 'New tag cannot be the same as old tag'}), 400
 
-    diary_entries = DiaryEntry.query.filter_by(user_id=current_user.id).all()
+    diary_entries = DiaryEntry.query.filter_by(user_id=current_user.id).options(defer(DiaryEntry.text)).all()
     updated_count = 0
     for entry in diary_entries:
         if entry.tags:
@@ -407,7 +490,7 @@ def rename_tag():
 @app.route('/api/tags/<string:tag_name>', methods=['DELETE'])
 @login_required
 def delete_tag(tag_name):
-    diary_entries = DiaryEntry.query.filter_by(user_id=current_user.id).all()
+    diary_entries = DiaryEntry.query.filter_by(user_id=current_user.id).options(defer(DiaryEntry.text)).all()
     updated_count = 0
     for entry in diary_entries:
         if entry.tags:
@@ -0,0 +1,139 @@
+import os
+import random
+import tempfile
+import time
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, defer
+
+# Importing app runs create_all(); keep that off the real instance database.
+os.environ.setdefault('DAILYBOOK_DATABASE_URI', 'sqlite://')
+from app import app, db, DiaryEntry, Note, like_pattern, search_text_column
+
+YEARS = 5
+USER_ID = 1
+SEED = 42
+SEARCH_QUERY = 'dentist'
+
+SUBJECTS = ["I", "We", "My sister", "Tom", "Anna", "The team", "Mom", "Dad", "Everyone"]
+VERBS = ["went to", "talked about", "finally finished", "worried about", "planned",
+         "cleaned", "forgot about", "looked forward to", "argued about", "enjoyed"]
+OBJECTS = ["the report", "the garden", "a new recipe", "the dentist appointment",
+           "the trip to Lisbon", "the quarterly budget", "an old movie", "the kids' school play",
+           "the broken bike", "our weekend plans", "the neighbours' party", "a long run"]
+TIMES = ["this morning", "after lunch", "in the evening", "before work", "late at night",
+         "on the way home", "during the meeting", "all afternoon", ""]
+FEELINGS = ["It felt great.", "Honestly it was exhausting.", "Not sure how I feel about it.",
+            "I should do that more often.", "That made my day.", "Still annoyed, to be honest.",
+            "Need to remember this next time.", ""]
+TAGS = ["work", "family", "health", "travel", "friends", "ideas"]
+
+def sentence(rng):
+    parts = [rng.choice(SUBJECTS), rng.choice(VERBS), rng.choice(OBJECTS), rng.choice(TIMES)]
+    text = ' '.join(p for p in parts if p) + rng.choice(['.', '!', '...'])
+    if rng.random() < 0.3:
+        text += f" It was around {rng.randint(1, 12)}:{rng.randint(0, 59):02d}, {rng.randint(2, 30)} minutes late."
+    feeling = rng.choice(FEELINGS)
+    return f"{text} {feeling}".strip()
+
+def seed_rows(seed):
+    rng = random.Random(seed)
+    start = time.mktime((2020, 1, 1, 12, 0, 0, 0, 0, -1))
+    for day in range(365 * YEARS):
+        date = time.strftime('%Y-%m-%d', time.localtime(start + day * 86400))
+        entry_text = ' '.join(sentence(rng) for _ in range(rng.randint(2, 25)))
+        note_text = ' '.join(sentence(rng) for _ in range(rng.randint(1, 8)))
+        tags = '[' + ', '.join(f'"{t}"' for t in rng.sample(TAGS, rng.randint(0, 3))) + ']'
+        yield date, entry_text, note_text, tags
+
+def build_db(path, rows, compressed):
+    engine = create_engine(f'sqlite:///{path}')
+    db.metadata.create_all(engine)
+    if compressed:
+        app.config['COMPRESS_TEXT'] = True
+        with Session(engine) as session:
+            for date, entry_text, note_text, tags in rows:
+                session.add(DiaryEntry(date=date, text=entry_text, tags=tags, user_id=USER_ID))
+                session.add(Note(date=date, text=note_text, user_id=USER_ID))
+            session.commit()
+    else:
+        # Raw inserts bypass CompressedText, giving the plain TEXT layout.
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                'INSERT INTO diary_entry (date, text, tags, user_id) VALUES (?, ?, ?, ?)',
+                [(d, e, t, USER_ID) for d, e, _, t in rows])
+            conn.exec_driver_sql(
+                'INSERT INTO note (date, text, user_id) VALUES (?, ?, ?)',
+                [(d, n, USER_ID) for d, _, n, _ in rows])
+    with engine.connect() as conn:
+        conn.exec_driver_sql('VACUUM')
+    return engine
+
+def stored_text_bytes(engine):
+    with engine.connect() as conn:
+        return sum(conn.exec_driver_sql(
+            f'SELECT COALESCE(SUM(LENGTH(CAST(text AS BLOB))), 0) FROM {table}').scalar()
+            for table in ('diary_entry', 'note'))
+
+def best_of(engine, run, repeat=20):
+    best = None
+    for _ in range(repeat):
+        with Session(engine) as session:
+            started = time.perf_counter()
+            run(session)
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+def tag_list(options=()):
+    def run(session):
+        entries = session.scalars(
+            select(DiaryEntry).filter_by(user_id=USER_ID).options(*options)).all()
+        [entry.tags for entry in entries]
+    return run
+
+def diary_list(session):
+    entries = session.scalars(
+        select(DiaryEntry).filter_by(user_id=USER_ID).order_by(DiaryEntry.date.desc())).all()
+    [entry.to_dict() for entry in entries]
+
+def note_list(session):
+    notes = session.scalars(
+        select(Note).filter_by(user_id=USER_ID).order_by(Note.date.desc())).all()
+    [note.to_dict() for note in notes]
+
+def search(session):
+    entries = search_text_column(
+        session.query(DiaryEntry).filter_by(user_id=USER_ID), DiaryEntry, SEARCH_QUERY,
+        extra_match=DiaryEntry.tags.ilike(like_pattern(SEARCH_QUERY), escape='\\'))
+    notes = search_text_column(
+        session.query(Note).filter_by(user_id=USER_ID), Note, SEARCH_QUERY)
+    [row.to_dict() for row in entries + notes]
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = list(seed_rows(SEED))
+        plain_path = os.path.join(tmp, 'plain.db')
+        packed_path = os.path.join(tmp, 'compressed.db')
+        plain = build_db(plain_path, rows, compressed=False)
+        packed = build_db(packed_path, rows, compressed=True)
+
+        raw = stored_text_bytes(plain)
+        stored = stored_text_bytes(packed)
+        plain_size = os.path.getsize(plain_path)
+        packed_size = os.path.getsize(packed_path)
+
+        print(f"Seeded {YEARS} years ({len(rows)} diary entries and notes, synthetic text)")
+        print(f"Text bytes:    plain {raw:>10,}  compressed {stored:>10,} ({stored / raw:.0%})")
+        print(f"Database file: plain {plain_size:>10,}  compressed {packed_size:>10,} "
+              f"({packed_size / plain_size:.0%})")
+        print(f"{'Query (best of 20, ms)':<28}{'plain':>8}{'compressed':>12}")
+        for label, run_plain, run_packed in [
+                ('tag list', tag_list(), tag_list()),
+                ('tag list, text deferred', tag_list([defer(DiaryEntry.text)]),
+                 tag_list([defer(DiaryEntry.text)])),
+                ('diary list', diary_list, diary_list),
+                ('note list', note_list, note_list),
+                (f'search "{SEARCH_QUERY}"', search, search)]:
+            print(f"{label:<28}{best_of(plain, run_plain):>8.1f}{best_of(packed, run_packed):>12.1f}")
+        plain.dispose()
+        packed.dispose()
@@ -0,0 +1,89 @@
+"""Build a zlib preset dictionary for CompressedText from existing bodies.
+
+Usage: python build_text_zdict.py <sqlite db> <output file> [sample size]
+
+Samples diary entry and note text from the database, counts word n-grams and
+keeps the ones that save the most bytes, up to zlib's 32 KB window. The most
+valuable strings are written last, closest to the data being compressed.
+Ship the output as a new TEXT_ZDICTS version in app.py; never overwrite a
+dictionary that rows may already be compressed with.
+"""
+import os
+import random
+import sqlite3
+import sys
+from collections import Counter
+
+# Importing app runs create_all(); keep that off the real instance database.
+os.environ.setdefault('DAILYBOOK_DATABASE_URI', 'sqlite://')
+from app import CompressedText
+
+ZDICT_SIZE = 32 * 1024
+MAX_NGRAM_WORDS = 6
+DEFAULT_SAMPLE_SIZE = 2000
+
+def load_bodies(db_path, sample_size, rng):
+    column = CompressedText()
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            'SELECT text FROM diary_entry WHERE text IS NOT NULL '
+            'UNION ALL SELECT text FROM note WHERE text IS NOT NULL').fetchall()
+    finally:
+        conn.close()
+    bodies = [column.process_result_value(text, None) for (text,) in rows]
+    bodies = [body for body in bodies if body]
+    return rng.sample(bodies, min(sample_size, len(bodies)))
+
+def build_zdict(bodies, size=ZDICT_SIZE):
+    counts = Counter()
+    for body in bodies:
+        words = body.split(' ')
+        for n in range(1, MAX_NGRAM_WORDS + 1):
+            for i in range(len(words) - n + 1):
+                counts[' '.join(words[i:i + n]) + ' '] += 1
+
+    # A string repeated c times costs one copy in the dictionary and saves
+    # roughly its length on each of the other occurrences.
+    candidates = sorted(
+        (((count - 1) * len(gram.encode('utf-8')), gram)
+         for gram, count in counts.items() if count > 1 and len(gram) > 3),
+        reverse=True)
+
+    # Grams already inside a chosen one are skipped with a substring check on
+    # the joined buffer ('\n' keeps matches from spanning two grams).
+    chosen = []
+    joined = ''
+    total = 0
+    for score, gram in candidates:
+        if total >= size:
+            break
+        if gram in joined:
+            continue
+        chosen.append((score, gram))
+        joined += gram + '\n'
+        total += len(gram.encode('utf-8'))
+
+    # A longer gram picked later can still contain shorter ones picked before it.
+    kept = []
+    joined = ''
+    for score, gram in sorted(chosen, key=lambda item: len(item[1]), reverse=True):
+        if gram not in joined:
+            kept.append((score, gram))
+            joined += gram + '\n'
+    kept.sort()
+    return ''.join(gram for _, gram in kept).encode('utf-8')[-size:]
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+    sample_size = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_SAMPLE_SIZE
+    bodies = load_bodies(sys.argv[1], sample_size, random.Random(0))
+    if not bodies:
+        print(f"No diary or note text found in {sys.argv[1]}")
+        sys.exit(1)
+    zdict = build_zdict(bodies)
+    with open(sys.argv[2], 'wb') as f:
+        f.write(zdict)
+    print(f"Wrote {len(zdict):,} byte dictionary from {len(bodies):,} bodies to {sys.argv[2]}")